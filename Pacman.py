@@ -1,6 +1,19 @@
 import pygame 
-import heapq   
-import math    
+from collections import deque
+import functools
+import heapq
+import itertools
+import numpy as np
+
+try:
+    from numba import njit  # Optional: compiles the A* core to native code
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False  # a_star_search uses the pure-Python heapq search instead
+
+    def njit(**options):
+        """Stand-in decorator so astar_numba still defines when Numba is missing"""
+        return lambda func: func
 
 # Initialize pygame
 pygame.init()
@@ -11,6 +24,7 @@ CELL_SIZE = 25       # Size of each cell in pixels
 SCREEN_WIDTH = GRID_SIZE * CELL_SIZE  # Total window width
 SCREEN_HEIGHT = GRID_SIZE * CELL_SIZE # Total window height
 FPS = 60             # Frames per second for game loop
+COLLISION_DISTANCE_SQ = 0.5 ** 2  # Squared distance (in cells) at which a ghost catches a player
 
 # Movement directions
 DIRECTIONS = {
@@ -20,6 +34,11 @@ DIRECTIONS = {
     'RIGHT': (-1, 0) 
 }
 
+# Neighbor offsets used by A*; parent_dir stores an index into this list
+DELTAS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+UNVISITED = np.iinfo(np.uint16).max  # g_score of a cell A* has not reached
+MAX_PRIORITY = GRID_SIZE * GRID_SIZE + 2 * GRID_SIZE  # Bound on A* f = g + h, sizes the bucket queue
+
 #COLOR DEFINITIONS 
 WHITE = (255, 255, 255)   # Background/walls 
 BLACK = (0, 0, 0)         # Pellets 
@@ -30,55 +49,68 @@ GOLDEN = (255, 215, 0)    # Player color option
 ORANGE = (255, 165, 0)    # Player color option 
 AVAILABLE_COLORS = [GREEN, GOLDEN, ORANGE] # Player color choices
 
-# PRIORITY QUEUE FOR A* PATHFINDING 
-class PriorityQueue:
-    def __init__(self):
-        self.elements = []  # Stores elements with priorities
-
-    def empty(self):
-        return len(self.elements) == 0  # Check if queue is empty
-
-    def put(self, item, priority):
-        heapq.heappush(self.elements, (priority, item))  # Add item with priority
-
-    def get(self):
-        return heapq.heappop(self.elements)[1]  # Get item with lowest priority
+PELLET_RADIUS = 3  # Pellet size in pixels
+
+# ENTITY STORAGE: every player and ghost lives in one struct-of-arrays
+class Entities:
+    __slots__ = ('positions', 'directions', 'speeds', 'count')
+
+    def __init__(self, capacity):
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)  # (x, y) of each entity
+        self.directions = np.zeros((capacity, 2), dtype=np.int8)    # Movement direction of each entity
+        self.speeds = np.zeros(capacity, dtype=np.float32)          # Cells moved per step
+        self.count = 0  # Rows handed out so far
+
+    def add(self, x, y, direction, speed):
+        """Claim the next row for a new entity and return its index"""
+        idx = self.count
+        self.positions[idx] = (x, y)
+        self.directions[idx] = direction
+        self.speeds[idx] = speed
+        self.count += 1
+        return idx
+
+    def move(self, rows, grid):
+        """Step the given rows along their direction where the move is valid.
+
+        A move is valid if it stays within bounds and not on a wall. Returns
+        a boolean mask of the rows that moved.
+        """
+        new = self.positions[rows] + self.directions[rows] * self.speeds[rows, None]
+        cells = np.clip(new, 0, GRID_SIZE - 1).astype(np.intp)  # Clipped so the wall lookup stays in range
+        valid = ((new >= 0) & (new < GRID_SIZE)).all(axis=1) & (grid[cells[:, 1], cells[:, 0]] != 1)
+        self.positions[rows[valid]] = new[valid]
+        return valid
 
 # PLAYER CLASS (MULTIPLAYER) 
 class Player:
-    def __init__(self, id, x, y, color, name):
+    __slots__ = ('entities', 'idx', 'id', 'color', 'name', 'score', 'radius')
+
+    def __init__(self, entities, id, x, y, color, name):
+        self.entities = entities  # Shared storage holding this player's position
+        self.idx = entities.add(x, y, DIRECTIONS['RIGHT'], 0.5)  # Initial direction and speed
         self.id = id          
-        self.position = (x, y) 
         self.color = color     # Player color (chosen in menu)
         self.name = name       # "Player 1" or "Player 2"
-        self.direction = DIRECTIONS['RIGHT']  # Initial movement direction
         self.score = 0       
-        self.speed = 0.5       
         self.radius = CELL_SIZE // 2  # Visual size
 
-    def move(self, grid):
-        """Move player based on current direction if move is valid"""
-        new_x = self.position[0] + self.direction[0] * self.speed
-        new_y = self.position[1] + self.direction[1] * self.speed
-        if self.is_valid_move(new_x, new_y, grid):
-            self.position = (new_x, new_y)
-            self.collect_pellet(grid)  # Check if moved onto a pellet
-
-    def is_valid_move(self, x, y, grid):
-        """Check if position is within bounds and not a wall"""
-        return (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE 
-                and grid[int(y)][int(x)] != 1)
-
-    def collect_pellet(self, grid):
+    @property
+    def position(self):
+        """Current (x, y) position, read from the shared entity arrays"""
+        return tuple(self.entities.positions[self.idx].tolist())
+
+    def collect_pellet(self, grid, pellets):
         """Check current position for pellets and collect if present"""
         x, y = round(self.position[0]), round(self.position[1])
-        if grid[y][x] == 2:  # 2 represents a pellet
-            grid[y][x] = 0   # Remove pellet
+        if grid[y, x] == 2:  # 2 represents a pellet
+            grid[y, x] = 0   # Remove pellet
+            del pellets[(x, y)]  # Stop drawing it
             self.score += 10 # Increase score
 
     def change_direction(self, new_direction):
         """Change movement direction (called from keyboard input)"""
-        self.direction = new_direction
+        self.entities.directions[self.idx] = new_direction
 
     def draw(self, screen):
         """Render player as a colored circle"""
@@ -92,33 +124,41 @@ class Player:
 
 # GHOST CLASS 
 class Ghost:
-    def __init__(self, x, y, color):
-        self.position = (x, y)  # Starting position
+    __slots__ = ('entities', 'idx', 'color', 'radius', 'path', 'target_id')
+
+    def __init__(self, entities, x, y, color):
+        self.entities = entities  # Shared storage holding this ghost's position
+        self.idx = entities.add(x, y, (0, 0), 0.1)  # Movement speed (slower from 0.2)
         self.color = color      # Visual color
-        self.speed = 0.1       # Movement speed (slower from 0.2)
         self.radius = CELL_SIZE // 2  # Visual size
-        self.path = []          # Stores calculated path to player
+        self.path = deque()     # Stores calculated path to player
+        self.target_id = None   # id of the player the current path leads to
+
+    @property
+    def position(self):
+        """Current (x, y) position, read from the shared entity arrays"""
+        return tuple(self.entities.positions[self.idx].tolist())
+
+    @property
+    def needs_path(self):
+        """True once the ghost has consumed its current path"""
+        return not self.path
 
     def set_path(self, path):
         """Set a new path for the ghost to follow"""
-        self.path = path
+        self.path = deque(path)  # Consumed from the front as nodes are reached
 
     def move(self, grid):
         """Move ghost along the calculated path"""
         if self.path:
             next_pos = self.path[0]
-            # Calculate direction to next path node
-            dx = next_pos[0] - self.position[0]
-            dy = next_pos[1] - self.position[1]
-            # Update position
-            self.position = (
-                self.position[0] + self.speed * dx,
-                self.position[1] + self.speed * dy
-            )
+            position = self.entities.positions[self.idx]  # View, updated in place
+            # Step a fraction of the way towards the next path node
+            position += self.entities.speeds[self.idx] * (next_pos - position)
             # If reached next node, remove it from path
-            if abs(self.position[0] - next_pos[0]) < 0.1 and abs(self.position[1] - next_pos[1]) < 0.1:
-                self.position = next_pos
-                self.path.pop(0)
+            if (np.abs(position - next_pos) < 0.1).all():
+                position[:] = next_pos
+                self.path.popleft()
 
     def draw(self, screen):
         """Render ghost as a colored circle"""
@@ -135,113 +175,272 @@ def heuristic(a, b):
     """Manhattan distance heuristic for A* algorithm"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def a_star_search(start, goal, grid):
-    """A* pathfinding algorithm to find path from start to goal"""
-    start = (round(start[0]), round(start[1]))  # Snap to grid
-    goal = (round(goal[0]), round(goal[1]))    # Snap to grid
-    
-    frontier = PriorityQueue()
-    frontier.put(start, 0)
-    came_from = {}  # Tracks path
-    cost_so_far = {}  # Tracks movement cost
-    came_from[start] = None
-    cost_so_far[start] = 0
-
-    while not frontier.empty():
-        current = frontier.get()
-        if current == goal:  # Reached target
-            break
-        
-        # Explore all valid neighbors
-        for next_pos in get_neighbors(current, grid):
-            new_cost = cost_so_far[current] + 1
-            if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
-                cost_so_far[next_pos] = new_cost
-                priority = new_cost + heuristic(goal, next_pos)
-                frontier.put(next_pos, priority)
-                came_from[next_pos] = current
+def build_neighbors(grid):
+    """Precompute the open neighbors of every cell, since walls never change.
+
+    Row cid = y * GRID_SIZE + x lists the cell id reached by each DELTAS
+    direction, or -1 where that move is blocked.
+    """
+    neighbors = np.full((GRID_SIZE * GRID_SIZE, 4), -1, dtype=np.int16)
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            for i, (dx, dy) in enumerate(DELTAS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and grid[ny, nx] != 1:
+                    neighbors[y * GRID_SIZE + x, i] = ny * GRID_SIZE + nx
+    if not HAVE_NUMBA:
+        return neighbors.tolist()  # Plain lists index much faster than NumPy from pure Python
+    return neighbors
 
+@njit(cache=True)
+def astar_numba(neighbors, sx, sy, gx, gy, out_path):
+    """Bidirectional A* core on integer cells, written so Numba can compile it.
+
+    Side 0 searches forward from the start towards the goal and side 1
+    searches backward from the goal with the heuristic measured to the start.
+    Each step expands whichever side has the lower best f-value, and the
+    search stops once neither side can beat the shortest meeting path found.
+
+    Cells are identified by cid = y * GRID_SIZE + x and expanded through the
+    precomputed neighbors table. Costs are small integers, so each frontier is
+    a bucket queue: one linked list of entries per f-value plus a pointer to
+    the lowest non-empty bucket. The path (excluding the start) is written to
+    out_path and its length returned, or -1 if the goal cannot be reached.
+    """
+    cells = GRID_SIZE * GRID_SIZE
+    bucket_head = np.full((2, MAX_PRIORITY), -1, dtype=np.int32)  # First entry in each f bucket, per side
+    entry_cell = np.empty(2 * (4 * cells + 1), dtype=np.int32)  # Each side pushes a cell at most 4 times
+    entry_next = np.empty(2 * (4 * cells + 1), dtype=np.int32)  # Next entry in the same bucket
+    parent_dir = np.full((2, cells), -1, dtype=np.int8)  # DELTAS index used to reach each cell, per side
+    g_score = np.full((2, cells), UNVISITED, dtype=np.uint16)  # Cost from the start / to the goal
+    closed = np.zeros((2, cells), dtype=np.bool_)  # Cells already expanded, per side
+    min_bucket = np.zeros(2, dtype=np.int64)  # f never decreases with a consistent heuristic
+    start = sy * GRID_SIZE + sx
+    goal = gy * GRID_SIZE + gx
+    if start == goal:
+        return 0
+    g_score[0, start] = 0
+    g_score[1, goal] = 0
+    entry_cell[0] = start  # Each origin sits alone in its bucket 0
+    entry_next[0] = -1
+    bucket_head[0, 0] = 0
+    entry_cell[1] = goal
+    entry_next[1] = -1
+    bucket_head[1, 0] = 1
+    entries = 2
+    best = UNVISITED  # Length of the shortest meeting path found so far
+    meet = -1  # Cell where that path joins the two searches
+
+    while True:
+        for side in range(2):
+            while min_bucket[side] < MAX_PRIORITY and bucket_head[side, min_bucket[side]] == -1:
+                min_bucket[side] += 1
+        if min_bucket[0] == MAX_PRIORITY or min_bucket[1] == MAX_PRIORITY:  # A frontier is exhausted
+            break
+        if min_bucket[0] >= best or min_bucket[1] >= best:  # No shorter meeting path is left
+            break
+        side = 0 if min_bucket[0] <= min_bucket[1] else 1
+        entry = bucket_head[side, min_bucket[side]]
+        bucket_head[side, min_bucket[side]] = entry_next[entry]
+        cid = entry_cell[entry]
+        if closed[side, cid]:  # Stale entry for an already expanded cell
+            continue
+        closed[side, cid] = True
+
+        # Explore all open neighbors (no walls/diagonals)
+        if side == 0:
+            tx, ty = gx, gy  # Forward search heads for the goal
+        else:
+            tx, ty = sx, sy  # Backward search heads for the start
+        new_cost = int(g_score[side, cid]) + 1
+        for i in range(4):
+            nid = neighbors[cid, i]
+            if nid < 0 or closed[side, nid]:
+                continue
+            if new_cost < g_score[side, nid]:
+                g_score[side, nid] = new_cost
+                priority = new_cost + abs(tx - nid % GRID_SIZE) + abs(ty - nid // GRID_SIZE)  # Manhattan heuristic
+                entry_cell[entries] = nid
+                entry_next[entries] = bucket_head[side, priority]
+                bucket_head[side, priority] = entries
+                entries += 1
+                parent_dir[side, nid] = i
+                # Reached by the other side too: the two half paths join here
+                if g_score[1 - side, nid] != UNVISITED and new_cost + int(g_score[1 - side, nid]) < best:
+                    best = new_cost + int(g_score[1 - side, nid])
+                    meet = nid
+
+    if meet == -1:  # No path found
+        return -1
+
+    # Forward half: step back from the meeting cell to the start
+    split = int(g_score[0, meet])
+    cid = meet
+    for k in range(split - 1, -1, -1):
+        out_path[k, 0] = cid % GRID_SIZE
+        out_path[k, 1] = cid // GRID_SIZE
+        dx, dy = DELTAS[parent_dir[0, cid]]
+        cid -= dy * GRID_SIZE + dx
+    # Backward half: follow the backward parents from the meeting cell to the goal
+    cid = meet
+    for k in range(split, best):
+        dx, dy = DELTAS[parent_dir[1, cid]]
+        cid -= dy * GRID_SIZE + dx
+        out_path[k, 0] = cid % GRID_SIZE
+        out_path[k, 1] = cid // GRID_SIZE
+    return best
+
+def _a_star_python(neighbors, start, goal):
+    """Pure-Python A* between cell ids, used when Numba is not installed.
+
+    Uses heapq and dicts rather than the array code in astar_numba, which is
+    slow when it runs uncompiled.
+    """
+    heappush, heappop = heapq.heappush, heapq.heappop  # Local names for the hot loop
+    gx, gy = goal % GRID_SIZE, goal // GRID_SIZE
+    frontier = [(0, start)]  # Heap of (priority, cell id), ids compare cheaply on ties
+    came_from = {start: None}  # Tracks path
+    cost_so_far = {start: 0}  # Tracks movement cost
+    closed = set()  # Cells already expanded
+
+    while frontier:
+        _, current = heappop(frontier)
+        if current == goal:  # Reached target, stop before expanding it
+            break
+        if current in closed:  # Stale heap entry for an already expanded cell
+            continue
+        closed.add(current)
+
+        # Explore all open neighbors (no walls/diagonals)
+        new_cost = cost_so_far[current] + 1
+        for nid in neighbors[current]:
+            if nid < 0 or nid in closed:
+                continue
+            if new_cost < cost_so_far.get(nid, UNVISITED):
+                cost_so_far[nid] = new_cost
+                priority = new_cost + abs(gx - nid % GRID_SIZE) + abs(gy - nid // GRID_SIZE)  # Manhattan heuristic
+                heappush(frontier, (priority, nid))
+                came_from[nid] = current
+
+    if goal not in came_from:  # No path found
+        return []
     # Reconstruct path
     path = []
     current = goal
     while current != start:
-        path.append(current)
-        current = came_from.get(current)
-        if current is None:  # No path found
-            break
+        path.append((current % GRID_SIZE, current // GRID_SIZE))
+        current = came_from[current]
     path.reverse()
     return path
 
-def get_neighbors(pos, grid):
-    """Get valid adjacent cells (no walls/diagonals)"""
-    x, y = map(int, pos)
-    neighbors = []
-    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # 4-directional
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and grid[ny][nx] != 1:
-            neighbors.append((nx, ny))
-    return neighbors
+PATH_BUFFER = np.empty((GRID_SIZE * GRID_SIZE, 2), dtype=np.int32)  # Reused output for astar_numba
 
-def sync_paths(players, ghosts, grid):
-    """Update ghost paths to chase the closest player"""
+def a_star_search(start, goal, neighbors):
+    """A* pathfinding algorithm to find path from start to goal"""
+    sx, sy = round(start[0]), round(start[1])  # Snap to grid
+    gx, gy = round(goal[0]), round(goal[1])    # Snap to grid
+    if not HAVE_NUMBA:
+        return _a_star_python(neighbors, sy * GRID_SIZE + sx, gy * GRID_SIZE + gx)
+    length = astar_numba(neighbors, sx, sy, gx, gy, PATH_BUFFER)
+    if length <= 0:  # Already there, or no path found
+        return []
+    return [tuple(cell) for cell in PATH_BUFFER[:length].tolist()]
+
+def sync_paths(players, ghosts, neighbors):
+    """Update ghost paths to chase the closest player.
+
+    A ghost keeps its current path while it still ends on the cell of the
+    player it is chasing, so A* only re-runs when the closest player changes,
+    that player moves to another cell, or the path runs out.
+    """
     for ghost in ghosts:
         # Find nearest player using Manhattan distance
         closest_player = min(players, key=lambda player: heuristic(ghost.position, player.position))
+        target_cell = (round(closest_player.position[0]), round(closest_player.position[1]))
+        if (ghost.target_id == closest_player.id and not ghost.needs_path
+                and ghost.path[-1] == target_cell):
+            continue  # Already on the way to the right player
         # Calculate new path
-        path = a_star_search(ghost.position, closest_player.position, grid)
+        path = a_star_search(ghost.position, closest_player.position, neighbors)
         ghost.set_path(path)
+        ghost.target_id = closest_player.id
 
 # GAME WORLD FUNCTIONS
 def create_grid():
     """Create the game maze with walls and pellets"""
-    grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)  # Indexed as grid[y, x]
     
     # Border walls
-    for i in range(GRID_SIZE):
-        grid[0][i] = grid[GRID_SIZE - 1][i] = 1  # Top and bottom
-        grid[i][0] = grid[i][GRID_SIZE - 1] = 1  # Left and right
+    grid[0, :] = grid[-1, :] = 1  # Top and bottom
+    grid[:, 0] = grid[:, -1] = 1  # Left and right
     
     # Inner walls
-    for i in range(5, 15):
-        grid[5][i] = grid[15][i] = 1  # Horizontal barriers
+    grid[5, 5:15] = grid[15, 5:15] = 1  # Horizontal barriers
     
     # Add pellets to all empty spaces
-    for i in range(1, GRID_SIZE - 1):
-        for j in range(1, GRID_SIZE - 1):
-            if grid[j][i] == 0:
-                grid[j][i] = 2  # 2 represents a pellet
+    inner = grid[1:-1, 1:-1]
+    inner[inner == 0] = 2  # 2 represents a pellet
     return grid
 
-def draw_grid(screen, grid):
-    """Render the game grid with walls and pellets"""
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            if grid[y][x] == 1:  # Wall
-                pygame.draw.rect(screen, RED, rect)
-            elif grid[y][x] == 2:  # Pellet
-                pygame.draw.circle(
-                    screen,
-                    BLACK,
-                    (int(x * CELL_SIZE + CELL_SIZE // 2),
-                     int(y * CELL_SIZE + CELL_SIZE // 2)),
-                    3
-                )
-
-def check_collision(players, ghosts):
+def create_pellet_positions(grid):
+    """Map each pellet cell (x, y) to the pixel position its sprite is blitted at"""
+    pel_ys, pel_xs = np.nonzero(grid == 2)
+    return {
+        (x, y): (x * CELL_SIZE + CELL_SIZE // 2 - PELLET_RADIUS,
+                 y * CELL_SIZE + CELL_SIZE // 2 - PELLET_RADIUS)
+        for x, y in zip(pel_xs.tolist(), pel_ys.tolist())
+    }
+
+def create_wall_surface(grid):
+    """Pre-render the background and walls once, since walls never change"""
+    wall_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    wall_surface.fill(WHITE)
+    wall_ys, wall_xs = np.nonzero(grid == 1)
+    for y, x in zip(wall_ys.tolist(), wall_xs.tolist()):
+        pygame.draw.rect(wall_surface, RED, pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    return wall_surface
+
+def create_pellet_sprite():
+    """Draw the pellet once, then it is blitted in a single batch each frame"""
+    size = PELLET_RADIUS * 2 + 1
+    pellet_sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(pellet_sprite, BLACK, (PELLET_RADIUS, PELLET_RADIUS), PELLET_RADIUS)
+    return pellet_sprite
+
+def draw_grid(screen, wall_surface, pellet_sprite, pellets):
+    """Render the cached walls and the remaining pellets"""
+    screen.blit(wall_surface, (0, 0))  # Also clears the previous frame
+    # One batched call instead of a draw.circle per pellet
+    screen.blits(zip(itertools.repeat(pellet_sprite), pellets.values()), False)
+
+def check_collision(entities, players, ghosts):
     """Check if any ghost caught any player"""
-    for player in players:
-        for ghost in ghosts:
-            if math.dist(player.position, ghost.position) < 0.5:  # Collision distance
-                return player.name  # Return which player lost
+    player_pos = entities.positions[[player.idx for player in players]]
+    ghost_pos = entities.positions[[ghost.idx for ghost in ghosts]]
+    diff = player_pos[:, None, :] - ghost_pos[None, :, :]  # Every player/ghost pair at once
+    hits = np.argwhere((diff * diff).sum(-1) < COLLISION_DISTANCE_SQ)  # No sqrt needed
+    if len(hits):
+        return players[hits[0, 0]].name  # Return which player lost
     return None
 
 # UI FUNCTIONS 
+_FONT_CACHE = {}  # Font objects by size, loading a font is expensive
+
+def _font(size):
+    """Return the default font at the given size, loading it only once"""
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        font = _FONT_CACHE[size] = pygame.font.Font(None, size)
+    return font
+
+@functools.lru_cache(maxsize=64)
+def render_text(text, color, size):
+    """Rasterize text once; scores change rarely so most frames hit the cache"""
+    return _font(size).render(text, True, color)
+
 def draw_text(screen, text, position, color=BLACK, size=24):
     """Helper function to render text"""
-    font = pygame.font.Font(None, size)
-    label = font.render(text, True, color)
-    screen.blit(label, position)
+    screen.blit(render_text(text, color, size), position)
 
 def color_selection_menu(screen, player_number):
     """Menu for players to choose their colors"""
@@ -317,10 +516,14 @@ def game_over_menu(screen, loser):
 # GAME LOOP
 def main():
     """Main game initialization and loop"""
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED | pygame.DOUBLEBUF)
     pygame.display.set_caption("PAC-MAN Multiplayer with A*")
+    pellet_sprite = create_pellet_sprite()  # Needs the display for convert_alpha
     clock = pygame.time.Clock()
 
+    # Compile the A* core now (when Numba is present) so the first game frame doesn't pay for it
+    a_star_search((1, 1), (2, 1), build_neighbors(create_grid()))
+
     while True:  # Outer loop for game restarts
         start_menu(screen)
 
@@ -329,65 +532,74 @@ def main():
         player2_color = color_selection_menu(screen, 2)
 
         grid = create_grid()
+        neighbors = build_neighbors(grid)  # Walls are fixed, so this is built once per game
+        wall_surface = create_wall_surface(grid)
+        pellets = create_pellet_positions(grid)
+
+        entities = Entities(4)  # Two players and two ghosts
 
         # MULTIPLAYER: Create two player instances
-        player1 = Player(1, 1, 1, player1_color, "Player 1")  # Top-left start
-        player2 = Player(2, GRID_SIZE - 2, GRID_SIZE - 2, player2_color, "Player 2")  # Bottom-right start
+        player1 = Player(entities, 1, 1, 1, player1_color, "Player 1")  # Top-left start
+        player2 = Player(entities, 2, GRID_SIZE - 2, GRID_SIZE - 2, player2_color, "Player 2")  # Bottom-right start
         players = [player1, player2]  # Store both players
+        player_rows = np.array([player.idx for player in players])
 
         # Create ghosts
-        ghost1 = Ghost(GRID_SIZE // 2, GRID_SIZE // 2, PURPLE)
-        ghost2 = Ghost(GRID_SIZE // 2 + 2, GRID_SIZE // 2, ORANGE)
+        ghost1 = Ghost(entities, GRID_SIZE // 2, GRID_SIZE // 2, PURPLE)
+        ghost2 = Ghost(entities, GRID_SIZE // 2 + 2, GRID_SIZE // 2, ORANGE)
         ghosts = [ghost1, ghost2]
 
+
         running = True
         while running:  # Main game loop
-            # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                
-                # MULTIPLAYER INPUT: Different controls for each player
-                if event.type == pygame.KEYDOWN:
-                    # Player 1 controls (WASD)
-                    if event.key == pygame.K_w:
-                        player1.change_direction(DIRECTIONS['UP'])
-                    elif event.key == pygame.K_s:
-                        player1.change_direction(DIRECTIONS['DOWN'])
-                    elif event.key == pygame.K_a:
-                        player1.change_direction(DIRECTIONS['LEFT'])
-                    elif event.key == pygame.K_d:
-                        player1.change_direction(DIRECTIONS['RIGHT'])
-                    # Player 2 controls (Arrow keys)
-                    elif event.key == pygame.K_UP:
-                        player2.change_direction(DIRECTIONS['UP'])
-                    elif event.key == pygame.K_DOWN:
-                        player2.change_direction(DIRECTIONS['DOWN'])
-                    elif event.key == pygame.K_LEFT:
-                        player2.change_direction(DIRECTIONS['LEFT'])
-                    elif event.key == pygame.K_RIGHT:
-                        player2.change_direction(DIRECTIONS['RIGHT'])
-
-            # MULTIPLAYER:
-            for player in players:
-                player.move(grid)
+            # Event handling: only QUIT needs the queue, the rest is discarded
+            pygame.event.pump()
+            if pygame.event.peek(pygame.QUIT, pump=False):
+                pygame.quit()
+                exit()
+            pygame.event.clear(pump=False)  # Keep stray key events out of the menus
+
+            # MULTIPLAYER INPUT: Different controls for each player, polled so held keys steer
+            keys = pygame.key.get_pressed()
+            # Player 1 controls (WASD)
+            if keys[pygame.K_w]:
+                player1.change_direction(DIRECTIONS['UP'])
+            elif keys[pygame.K_s]:
+                player1.change_direction(DIRECTIONS['DOWN'])
+            elif keys[pygame.K_a]:
+                player1.change_direction(DIRECTIONS['LEFT'])
+            elif keys[pygame.K_d]:
+                player1.change_direction(DIRECTIONS['RIGHT'])
+            # Player 2 controls (Arrow keys)
+            if keys[pygame.K_UP]:
+                player2.change_direction(DIRECTIONS['UP'])
+            elif keys[pygame.K_DOWN]:
+                player2.change_direction(DIRECTIONS['DOWN'])
+            elif keys[pygame.K_LEFT]:
+                player2.change_direction(DIRECTIONS['LEFT'])
+            elif keys[pygame.K_RIGHT]:
+                player2.change_direction(DIRECTIONS['RIGHT'])
+
+            # MULTIPLAYER: Move both players in one step, then collect pellets
+            moved = entities.move(player_rows, grid)
+            for player, has_moved in zip(players, moved):
+                if has_moved:
+                    player.collect_pellet(grid, pellets)
             
             # Ghost AI: Chase closest player
-            sync_paths(players, ghosts, grid)
+            sync_paths(players, ghosts, neighbors)
             for ghost in ghosts:
                 ghost.move(grid)
 
             # MULTIPLAYER: Check if any player was caught
-            loser = check_collision(players, ghosts)
+            loser = check_collision(entities, players, ghosts)
             if loser:
                 retry = game_over_menu(screen, loser)
                 if retry:
                     break  # Restart game
 
             # Rendering
-            screen.fill(WHITE)
-            draw_grid(screen, grid)
+            draw_grid(screen, wall_surface, pellet_sprite, pellets)
             
             # MULTIPLAYER: Draw both players and their scores
             for player in players:
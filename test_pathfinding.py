@@ -0,0 +1,106 @@
+"""Check a_star_search against breadth-first search.
+
+Run with `python -m pytest test_pathfinding.py` or `python test_pathfinding.py`.
+Set NUMBA_DISABLE_JIT=1 to exercise the uncompiled A* core.
+"""
+import os
+import random
+from collections import deque
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Pacman initialises pygame on import
+
+import numpy as np
+
+import Pacman
+
+GRID_SIZE = Pacman.GRID_SIZE
+
+
+def bfs_distances(grid, start):
+    """Shortest step count from start to every reachable open cell"""
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in Pacman.DELTAS:
+            nx, ny = x + dx, y + dy
+            if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and grid[ny, nx] != 1
+                    and (nx, ny) not in dist):
+                dist[(nx, ny)] = dist[(x, y)] + 1
+                queue.append((nx, ny))
+    return dist
+
+
+def random_grid(rng):
+    """The game maze with a random number of extra walls"""
+    grid = Pacman.create_grid()
+    for _ in range(rng.randint(0, 150)):
+        grid[rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE)] = 1
+    return grid
+
+
+def assert_shortest_path(grid, start, goal, path, dist):
+    """path must be a wall-free, 4-connected shortest route ending on goal"""
+    expected = dist.get(goal)
+    if expected is None:
+        assert path == [], (start, goal, path)
+        return
+    assert len(path) == expected, (start, goal, path, expected)
+    previous = start
+    for x, y in path:
+        assert abs(x - previous[0]) + abs(y - previous[1]) == 1, (start, goal, path)
+        assert grid[y, x] != 1, (start, goal, path)
+        previous = (x, y)
+    assert previous == goal, (start, goal, path)
+
+
+def check_searches(search, grids, pairs_per_grid, seed):
+    """Run search(grid, neighbors, start, goal) on random open-cell pairs"""
+    rng = random.Random(seed)
+    for grid in grids(rng):
+        neighbors = Pacman.build_neighbors(grid)
+        free = [(x, y) for y in range(GRID_SIZE) for x in range(GRID_SIZE) if grid[y, x] != 1]
+        for _ in range(pairs_per_grid):
+            start, goal = rng.choice(free), rng.choice(free)
+            path = search(grid, neighbors, start, goal)
+            assert_shortest_path(grid, start, goal, path, bfs_distances(grid, start))
+
+
+def a_star(grid, neighbors, start, goal):
+    return list(Pacman.a_star_search(start, goal, neighbors))
+
+
+def a_star_python(grid, neighbors, start, goal):
+    if isinstance(neighbors, np.ndarray):
+        neighbors = neighbors.tolist()
+    return Pacman._a_star_python(neighbors, start[1] * GRID_SIZE + start[0],
+                                 goal[1] * GRID_SIZE + goal[0])
+
+
+def test_game_maze_matches_bfs():
+    check_searches(a_star, lambda rng: [Pacman.create_grid()], 1000, seed=0)
+
+
+def test_random_walls_match_bfs():
+    check_searches(a_star, lambda rng: (random_grid(rng) for _ in range(100)), 20, seed=1)
+
+
+def test_python_fallback_matches_bfs():
+    check_searches(a_star_python, lambda rng: (random_grid(rng) for _ in range(100)), 20, seed=2)
+
+
+def test_unreachable_goal_and_same_cell():
+    grid = Pacman.create_grid()
+    grid[1, 2] = grid[2, 1] = 1  # Seal off the corner cell (1, 1)
+    neighbors = Pacman.build_neighbors(grid)
+    assert Pacman.a_star_search((5, 8), (1, 1), neighbors) == []
+    assert Pacman.a_star_search((1, 1), (5, 8), neighbors) == []
+    assert Pacman.a_star_search((3, 3), (3, 3), neighbors) == []
+
+
+if __name__ == "__main__":
+    test_game_maze_matches_bfs()
+    test_random_walls_match_bfs()
+    test_python_fallback_matches_bfs()
+    test_unreachable_goal_and_same_cell()
+    print("All pathfinding checks passed")